@@ -17,78 +17,122 @@
 
 
 from flask import Flask, request
-from queue import Queue
+from queue import Full
 from services.webhook import send_webhook
+from services.fast_queue import RingQueue
 import threading
+import logging
 import uuid
+from functools import partial
 import os
 import time
 from version import BUILD_NUMBER  # Import the BUILD_NUMBER
-from app_utils import log_job_status, discover_and_register_blueprints  # Import the discover_and_register_blueprints function
+from app_utils import discover_and_register_blueprints, OrjsonProvider  # Import the discover_and_register_blueprints function
+from services import job_logger
+
+logger = logging.getLogger(__name__)
+
+# Job timings are taken with time.monotonic_ns() (immune to wall-clock changes)
+# and reported in seconds with millisecond precision
+NS_PER_MS = 1_000_000
 
 MAX_QUEUE_LENGTH = int(os.environ.get('MAX_QUEUE_LENGTH', 0))
+QUEUE_WORKERS = max(int(os.environ.get('QUEUE_WORKERS', 1)), 1)
 
 def create_app():
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)  # orjson for request parsing and JSON responses
 
     # Create a queue to hold tasks
-    task_queue = Queue()
+    task_queue = RingQueue(maxsize=MAX_QUEUE_LENGTH)  # 0 means unbounded
     queue_id = id(task_queue)  # Generate a single queue_id for this worker
+    pid = os.getpid()  # The worker process doesn't change, so look the PID up once
+
+    # Constant fields of the queue_task responses, built once instead of per request
+    completed_template = {
+        "queue_time": 0,
+        "pid": pid,
+        "queue_id": queue_id,
+        "build_number": BUILD_NUMBER  # Add build number to response
+    }
+    rejected_template = {
+        "code": 429,
+        "message": f"MAX_QUEUE_LENGTH ({MAX_QUEUE_LENGTH}) reached",
+        "pid": pid,
+        "queue_id": queue_id,
+        "build_number": BUILD_NUMBER  # Add build number to response
+    }
+    accepted_template = {
+        "code": 202,
+        "message": "processing",
+        "pid": pid,
+        "queue_id": queue_id,
+        "max_queue_length": MAX_QUEUE_LENGTH if MAX_QUEUE_LENGTH > 0 else "unlimited",
+        "build_number": BUILD_NUMBER  # Add build number to response
+    }
 
     # Function to process tasks from the queue
     def process_queue():
+        # Bind the per-job calls to locals once; this loop runs for the life of
+        # the worker, so it avoids repeated global/attribute lookups per job
+        get = task_queue.get
+        qsize = task_queue.qsize
+        task_done = task_queue.task_done
+        submit_status = job_logger.submit
+        now = time.monotonic_ns
+
         while True:
-            job_id, data, task_func, queue_start_time = task_queue.get()
-            queue_time = time.time() - queue_start_time
-            run_start_time = time.time()
-            pid = os.getpid()  # Get the PID of the actual processing thread
+            # One job at a time, so every job not yet running stays in the queue
+            # and counts against MAX_QUEUE_LENGTH
+            job_id, data, task_func, queue_start_time = get()
+            run_start_time = now()
             
             # Log job status as running
-            log_job_status(job_id, {
-                "job_status": "running",
-                "job_id": job_id,
-                "queue_id": queue_id,
-                "process_id": pid,
-                "response": None
-            })
+            submit_status(job_id, "running", queue_id, pid)
             
-            response = task_func()
-            run_time = time.time() - run_start_time
-            total_time = time.time() - queue_start_time
+            try:
+                response = task_func()
+            except Exception as e:
+                # Report the failure instead of letting it kill the worker thread
+                logger.exception("Job %s: Unhandled error in queued task", job_id)
+                response = (str(e), None, 500)
+            run_end_time = now()
+            result, endpoint, code = response
 
             response_data = {
-                "endpoint": response[1],
-                "code": response[2],
+                "endpoint": endpoint,
+                "code": code,
                 "id": data.get("id"),
                 "job_id": job_id,
-                "response": response[0] if response[2] == 200 else None,
-                "message": "success" if response[2] == 200 else response[0],
+                "response": result if code == 200 else None,
+                "message": "success" if code == 200 else result,
                 "pid": pid,
                 "queue_id": queue_id,
-                "run_time": round(run_time, 3),
-                "queue_time": round(queue_time, 3),
-                "total_time": round(total_time, 3),
-                "queue_length": task_queue.qsize(),
+                "run_time": (run_end_time - run_start_time) // NS_PER_MS / 1000,
+                "queue_time": (run_start_time - queue_start_time) // NS_PER_MS / 1000,
+                "total_time": (run_end_time - queue_start_time) // NS_PER_MS / 1000,
+                "queue_length": qsize(),
                 "build_number": BUILD_NUMBER  # Add build number to response
             }
             
             # Log job status as done
-            log_job_status(job_id, {
-                "job_status": "done",
-                "job_id": job_id,
-                "queue_id": queue_id,
-                "process_id": pid,
-                "response": response_data
-            })
+            submit_status(job_id, "done", queue_id, pid, response_data)
 
             # Only send webhook if webhook_url has an actual value (not an empty string)
-            if data.get("webhook_url") and data.get("webhook_url") != "":
-                send_webhook(data.get("webhook_url"), response_data)
+            webhook_url = data.get("webhook_url")
+            if webhook_url:
+                send_webhook(webhook_url, response_data)
+
+            task_done()
 
-            task_queue.task_done()
+            # Don't keep the finished job's payload and response alive while
+            # this worker waits for the next job
+            del data, task_func, response, result, response_data
 
-    # Start the queue processing in a separate thread
-    threading.Thread(target=process_queue, daemon=True).start()
+    # Start long-lived queue worker threads. Jobs mostly wait on ffmpeg/whisper
+    # and network I/O outside the GIL, so extra workers run jobs concurrently
+    for _ in range(QUEUE_WORKERS):
+        threading.Thread(target=process_queue, daemon=True).start()
 
     # Decorator to add tasks to the queue or bypass it
     def queue_task(bypass_queue=False):
@@ -96,94 +140,61 @@ def create_app():
             def wrapper(*args, **kwargs):
                 job_id = str(uuid.uuid4())
                 data = request.json if request.is_json else {}
-                pid = os.getpid()  # Get PID for non-queued tasks
-                start_time = time.time()
+                req_id = data.get("id") if data else None
+                start_time = time.monotonic_ns()
                 
                 if bypass_queue or 'webhook_url' not in data:
                     
                     # Log job status as running immediately (bypassing queue)
-                    log_job_status(job_id, {
-                        "job_status": "running",
-                        "job_id": job_id,
-                        "queue_id": queue_id,
-                        "process_id": pid,
-                        "response": None
-                    })
+                    job_logger.submit(job_id, "running", queue_id, pid)
                     
                     response = f(job_id=job_id, data=data, *args, **kwargs)
-                    run_time = time.time() - start_time
+                    run_time = (time.monotonic_ns() - start_time) // NS_PER_MS / 1000
                     
-                    response_obj = {
-                        "code": response[2],
-                        "id": data.get("id"),
-                        "job_id": job_id,
-                        "response": response[0] if response[2] == 200 else None,
-                        "message": "success" if response[2] == 200 else response[0],
-                        "run_time": round(run_time, 3),
-                        "queue_time": 0,
-                        "total_time": round(run_time, 3),
-                        "pid": pid,
-                        "queue_id": queue_id,
-                        "queue_length": task_queue.qsize(),
-                        "build_number": BUILD_NUMBER  # Add build number to response
-                    }
+                    response_obj = dict(
+                        completed_template,
+                        code=response[2],
+                        id=req_id,
+                        job_id=job_id,
+                        response=response[0] if response[2] == 200 else None,
+                        message="success" if response[2] == 200 else response[0],
+                        run_time=run_time,
+                        total_time=run_time,
+                        queue_length=task_queue.qsize()
+                    )
                     
                     # Log job status as done
-                    log_job_status(job_id, {
-                        "job_status": "done",
-                        "job_id": job_id,
-                        "queue_id": queue_id,
-                        "process_id": pid,
-                        "response": response_obj
-                    })
+                    job_logger.submit(job_id, "done", queue_id, pid, response_obj)
                     
                     return response_obj, response[2]
                 else:
-                    if MAX_QUEUE_LENGTH > 0 and task_queue.qsize() >= MAX_QUEUE_LENGTH:
-                        error_response = {
-                            "code": 429,
-                            "id": data.get("id"),
-                            "job_id": job_id,
-                            "message": f"MAX_QUEUE_LENGTH ({MAX_QUEUE_LENGTH}) reached",
-                            "pid": pid,
-                            "queue_id": queue_id,
-                            "queue_length": task_queue.qsize(),
-                            "build_number": BUILD_NUMBER  # Add build number to response
-                        }
+                    # Log job status as queued before the job becomes visible to
+                    # the workers, so its running/done updates are written after it
+                    job_logger.submit(job_id, "queued", queue_id, pid)
+                    
+                    # The queue enforces MAX_QUEUE_LENGTH itself, so the capacity
+                    # check and the insert happen atomically
+                    try:
+                        task_queue.put_nowait((job_id, data, partial(f, *args, job_id=job_id, data=data, **kwargs), start_time))
+                    except Full:
+                        error_response = dict(
+                            rejected_template,
+                            id=req_id,
+                            job_id=job_id,
+                            queue_length=task_queue.qsize()
+                        )
                         
                         # Log the queue overflow error
-                        log_job_status(job_id, {
-                            "job_status": "done",
-                            "job_id": job_id,
-                            "queue_id": queue_id,
-                            "process_id": pid,
-                            "response": error_response
-                        })
+                        job_logger.submit(job_id, "done", queue_id, pid, error_response)
                         
                         return error_response, 429
                     
-                    # Log job status as queued
-                    log_job_status(job_id, {
-                        "job_status": "queued",
-                        "job_id": job_id,
-                        "queue_id": queue_id,
-                        "process_id": pid,
-                        "response": None
-                    })
-                    
-                    task_queue.put((job_id, data, lambda: f(job_id=job_id, data=data, *args, **kwargs), start_time))
-                    
-                    return {
-                        "code": 202,
-                        "id": data.get("id"),
-                        "job_id": job_id,
-                        "message": "processing",
-                        "pid": pid,
-                        "queue_id": queue_id,
-                        "max_queue_length": MAX_QUEUE_LENGTH if MAX_QUEUE_LENGTH > 0 else "unlimited",
-                        "queue_length": task_queue.qsize(),
-                        "build_number": BUILD_NUMBER  # Add build number to response
-                    }, 202
+                    return dict(
+                        accepted_template,
+                        id=req_id,
+                        job_id=job_id,
+                        queue_length=task_queue.qsize()
+                    ), 202
             return wrapper
         return decorator
 
@@ -16,23 +16,58 @@
 
 
 
-from flask import request, jsonify, current_app
+from flask import request, jsonify, current_app, Blueprint
+from flask.json.provider import DefaultJSONProvider
 from functools import wraps
+import importlib
 import jsonschema
+import logging
+import orjson
+import glob
+import sys
 import os
 import json
 import time
 from config import LOCAL_STORAGE_PATH
 
+logger = logging.getLogger(__name__)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson, used for request.json parsing and for
+    dict/jsonify responses. Falls back to the stdlib encoder for formatting
+    options orjson does not support (e.g. indent in debug mode).
+    """
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.get("separators") == (",", ":"):
+            del kwargs["separators"]  # orjson output is already compact
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
 def validate_payload(schema):
+    # Check the schema and build its validator once when the route is decorated;
+    # jsonschema.validate() repeats both steps on every request
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    validator = validator_class(schema)
+
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
             if not request.json:
                 return jsonify({"message": "Missing JSON in request"}), 400
-            try:
-                jsonschema.validate(instance=request.json, schema=schema)
-            except jsonschema.exceptions.ValidationError as validation_error:
+            validation_error = jsonschema.exceptions.best_match(validator.iter_errors(request.json))
+            if validation_error is not None:
                 return jsonify({"message": f"Invalid payload: {validation_error.message}"}), 400
             
             return f(*args, **kwargs)
@@ -50,20 +85,28 @@ def log_job_status(job_id, data):
     jobs_dir = os.path.join(LOCAL_STORAGE_PATH, 'jobs')
     
     # Create jobs directory if it doesn't exist
-    if not os.path.exists(jobs_dir):
-        os.makedirs(jobs_dir, exist_ok=True)
+    os.makedirs(jobs_dir, exist_ok=True)
     
     # Create or update the job log file
     job_file = os.path.join(jobs_dir, f"{job_id}.json")
     
-    # Write data directly to file
+    # Serialize once with the C encoder (json.dump/indent fall back to the
+    # pure-Python encoder and issue many small writes), then write in one call
+    payload = json.dumps(data)
     with open(job_file, 'w') as f:
-        json.dump(data, f, indent=2)
+        f.write(payload)
 
 def queue_task_wrapper(bypass_queue=False):
     def decorator(f):
+        # The app's queue_task wrapper is built on first use and reused, rather
+        # than re-creating the decorator closures on every request
+        wrapped_by_app = {}
         def wrapper(*args, **kwargs):
-            return current_app.queue_task(bypass_queue=bypass_queue)(f)(*args, **kwargs)
+            app = current_app._get_current_object()
+            wrapped = wrapped_by_app.get(app)
+            if wrapped is None:
+                wrapped = wrapped_by_app[app] = app.queue_task(bypass_queue=bypass_queue)(f)
+            return wrapped(*args, **kwargs)
         return wrapper
     return decorator
 
@@ -76,16 +119,6 @@ def discover_and_register_blueprints(app, base_dir='routes'):
         app (Flask): The Flask application instance
         base_dir (str): Base directory to start searching for blueprints (default: 'routes')
     """
-    import importlib
-    import pkgutil
-    import inspect
-    import sys
-    import os
-    from flask import Blueprint
-    import logging
-    import glob
-
-    logger = logging.getLogger(__name__)
     logger.info(f"Discovering blueprints in {base_dir}")
     
     # Add the current working directory to sys.path if it's not already there
@@ -98,6 +131,7 @@ def discover_and_register_blueprints(app, base_dir='routes'):
         base_dir = os.path.join(cwd, base_dir)
     
     registered_blueprints = set()
+    pid = os.getpid()
     
     # Find all Python files in the routes directory, including subdirectories
     python_files = glob.glob(os.path.join(base_dir, '**', '*.py'), recursive=True)
@@ -121,10 +155,11 @@ def discover_and_register_blueprints(app, base_dir='routes'):
             # Import the module
             module = importlib.import_module(module_path)
             
-            # Find all Blueprint instances in the module
-            for name, obj in inspect.getmembers(module):
+            # Find all Blueprint instances in the module. Scanning the module
+            # namespace directly avoids inspect.getmembers, which getattr()s
+            # and sorts every member of every route module at startup
+            for obj in list(vars(module).values()):
                 if isinstance(obj, Blueprint) and obj not in registered_blueprints:
-                    pid = os.getpid()
                     logger.info(f"PID {pid} Registering: {module_path}")
                     app.register_blueprint(obj)
                     registered_blueprints.add(obj)
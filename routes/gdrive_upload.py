@@ -21,8 +21,11 @@ import logging
 from flask import Blueprint, request, jsonify
 import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import uuid
 import json
+import mimetypes
 from google.oauth2.service_account import Credentials
 from google.auth.transport.requests import Request
 from datetime import datetime
@@ -31,8 +34,6 @@ import psutil
 from services.authentication import authenticate
 from app_utils import validate_payload, queue_task_wrapper
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Define the blueprint
@@ -42,6 +43,13 @@ gdrive_upload_bp = Blueprint('gdrive_upload', __name__)
 GCP_SA_CREDENTIALS = os.getenv('GCP_SA_CREDENTIALS')
 GDRIVE_USER = os.getenv('GDRIVE_USER')
 
+# Drive requires chunk sizes in multiples of 256 KB; bigger chunks mean fewer
+# PUT round-trips for large renders
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+# Files up to this size (Drive's multipart limit) are uploaded in one request
+# without opening a resumable session
+MULTIPART_UPLOAD_LIMIT = 5 * 1024 * 1024
+
 # Class to track upload progress
 class UploadProgress:
     def __init__(self, job_id, total_size):
@@ -57,20 +65,51 @@ class UploadProgress:
 active_uploads = []
 uploads_lock = threading.Lock()
 
+# Per-thread sessions for Drive API calls, so upload jobs reuse connections
+_thread_local = threading.local()
+
+# Delegated Drive credentials, parsed once and shared by all upload jobs
+delegated_credentials = None
+credentials_lock = threading.Lock()
+
 def get_access_token():
     """
     Retrieves an access token for Google APIs using service account credentials.
+    The credentials are parsed on first use and the token is only refreshed
+    once it has expired.
+    """
+    global delegated_credentials
+    with credentials_lock:
+        if delegated_credentials is None:
+            credentials_info = json.loads(GCP_SA_CREDENTIALS)
+            credentials = Credentials.from_service_account_info(
+                credentials_info,
+                scopes=['https://www.googleapis.com/auth/drive']
+            )
+            delegated_credentials = credentials.with_subject(GDRIVE_USER)
+        if not delegated_credentials.valid:
+            delegated_credentials.refresh(Request())
+        return delegated_credentials.token
+
+def get_drive_session():
     """
-    credentials_info = json.loads(GCP_SA_CREDENTIALS)
-    credentials = Credentials.from_service_account_info(
-        credentials_info,
-        scopes=['https://www.googleapis.com/auth/drive']
-    )
-    delegated_credentials = credentials.with_subject(GDRIVE_USER)
-    if not delegated_credentials.valid or delegated_credentials.expired:
-        delegated_credentials.refresh(Request())
-    access_token = delegated_credentials.token
-    return access_token
+    Return this thread's Drive session, creating it on first use.
+
+    Keeps the TLS connection to the upload endpoint alive between chunk PUTs.
+    Only failed connection attempts are retried here; retrying a chunk after a
+    network error is left to upload_file_in_chunks.
+    """
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, connect=3, read=0, status=0, backoff_factor=0.5)
+        )
+        session.mount('https://', adapter)
+        _thread_local.session = session
+    return session
 
 def initiate_resumable_upload(filename, folder_id, mime_type='application/octet-stream'):
     """
@@ -86,11 +125,58 @@ def initiate_resumable_upload(filename, folder_id, mime_type='application/octet-
         'name': filename,
         'parents': [folder_id]
     }
-    response = requests.post(url, headers=headers, data=json.dumps(metadata))
+    response = get_drive_session().post(url, headers=headers, data=json.dumps(metadata))
     response.raise_for_status()
     upload_url = response.headers['Location']
     return upload_url
 
+def upload_file_multipart(file_url, filename, folder_id, job_id, mime_type='application/octet-stream'):
+    """
+    Uploads a small file to Google Drive in a single multipart request and returns its file ID.
+    The whole file is held in memory, so this is only used up to MULTIPART_UPLOAD_LIMIT.
+    Network errors are retried like chunk uploads; HTTP error responses are not.
+    """
+    max_retries = 5
+    retry_delay = 5  # seconds
+    url = 'https://www.googleapis.com/upload/drive/v3/files?uploadType=multipart'
+    body = None
+
+    for attempt in range(max_retries):
+        try:
+            if body is None:
+                # Fetch the source once; later attempts only repeat the upload
+                response = requests.get(file_url, timeout=30)
+                response.raise_for_status()
+
+                # multipart/related body: JSON metadata part followed by the file content
+                boundary = uuid.uuid4().hex
+                metadata = json.dumps({'name': filename, 'parents': [folder_id]})
+                body = b''.join([
+                    f'--{boundary}\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n{metadata}\r\n'.encode(),
+                    f'--{boundary}\r\nContent-Type: {mime_type}\r\n\r\n'.encode(),
+                    response.content,
+                    f'\r\n--{boundary}--\r\n'.encode()
+                ])
+                del response
+
+            headers = {
+                'Authorization': f'Bearer {get_access_token()}',
+                'Content-Type': f'multipart/related; boundary={boundary}'
+            }
+            upload_response = get_drive_session().post(url, headers=headers, data=body, timeout=300)
+            upload_response.raise_for_status()
+            return upload_response.json()['id']
+        except requests.exceptions.HTTPError:
+            raise
+        except requests.exceptions.RequestException as e:
+            logger.error("Job %s: Network error during upload: %s", job_id, e)
+            if attempt < max_retries - 1:
+                logger.info("Job %s: Retrying upload after %s seconds...", job_id, retry_delay)
+                time.sleep(retry_delay)
+            else:
+                logger.error("Job %s: Max retries reached. Upload failed.", job_id)
+                raise
+
 def upload_file_in_chunks(file_url, upload_url, total_size, job_id, chunk_size):
     """
     Uploads the file to Google Drive in chunks by streaming data directly from the source URL.
@@ -100,6 +186,7 @@ def upload_file_in_chunks(file_url, upload_url, total_size, job_id, chunk_size):
     retry_delay = 5  # seconds
 
     progress = UploadProgress(job_id, total_size)
+    session = get_drive_session()
 
     # Add progress to active_uploads
     with uploads_lock:
@@ -120,14 +207,14 @@ def upload_file_in_chunks(file_url, upload_url, total_size, job_id, chunk_size):
                             'Content-Range': content_range,
                         }
                         try:
-                            upload_response = requests.put(
+                            upload_response = session.put(
                                 upload_url,
                                 headers=headers,
                                 data=chunk
                             )
                             if upload_response.status_code in (200, 201):
                                 # Upload complete
-                                logger.info(f"Job {job_id}: Upload complete.")
+                                logger.info("Job %s: Upload complete.", job_id)
                                 with progress.lock:
                                     progress.bytes_uploaded = end + 1
                                 return upload_response.json()['id']
@@ -139,16 +226,16 @@ def upload_file_in_chunks(file_url, upload_url, total_size, job_id, chunk_size):
                                 break  # Break retry loop and continue with next chunk
                             else:
                                 # Handle unexpected status codes
-                                logger.error(f"Job {job_id}: Unexpected status code: {upload_response.status_code}")
+                                logger.error("Job %s: Unexpected status code: %s", job_id, upload_response.status_code)
                                 raise Exception(f"Upload failed with status code {upload_response.status_code}")
                         except requests.exceptions.RequestException as e:
-                            logger.error(f"Job {job_id}: Network error during upload: {e}")
+                            logger.error("Job %s: Network error during upload: %s", job_id, e)
                             if attempt < max_retries - 1:
-                                logger.info(f"Job {job_id}: Retrying upload chunk after {retry_delay} seconds...")
+                                logger.info("Job %s: Retrying upload chunk after %s seconds...", job_id, retry_delay)
                                 time.sleep(retry_delay)
                                 continue
                             else:
-                                logger.error(f"Job {job_id}: Max retries reached. Upload failed.")
+                                logger.error("Job %s: Max retries reached. Upload failed.", job_id)
                                 raise
                     else:
                         # If we exhausted retries, exit the function
@@ -177,7 +264,7 @@ def upload_file_in_chunks(file_url, upload_url, total_size, job_id, chunk_size):
 })
 @queue_task_wrapper(bypass_queue=False)
 def gdrive_upload(job_id, data):
-    logger.info(f"Processing Job ID: {job_id}")
+    logger.info("Processing Job ID: %s", job_id)
 
     if not GDRIVE_USER:
         logger.error("GDRIVE_USER environment variable is not set")
@@ -187,32 +274,42 @@ def gdrive_upload(job_id, data):
         file_url = data['file_url']
         filename = data['filename']
         folder_id = data['folder_id']
-        mime_type = data.get('mime_type', 'application/octet-stream')
-        chunk_size = data.get('chunk_size', 5 * 1024 * 1024)  # Default to 5 MB
+        # Infer the type from the filename so images/audio aren't stored as octet-stream
+        mime_type = data.get('mime_type') or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        chunk_size = data.get('chunk_size', DEFAULT_CHUNK_SIZE)
 
         # Get the total size of the file
         try:
             head_response = requests.head(file_url, allow_redirects=True, timeout=30)
             head_response.raise_for_status()
             total_size = int(head_response.headers.get('Content-Length', 0))
-            
-            get_response = requests.get(file_url, stream=True, timeout=30)
-            get_response.raise_for_status()
-            total_size = int(get_response.headers.get('Content-Length', 0))
+
+            if total_size == 0:
+                # Some servers only report the size on GET; read the headers
+                # without downloading the body
+                with requests.get(file_url, stream=True, timeout=30) as get_response:
+                    get_response.raise_for_status()
+                    total_size = int(get_response.headers.get('Content-Length', 0))
             if total_size == 0:
                 raise ValueError("Content-Length header is missing or zero")
         except requests.exceptions.RequestException as e:
-            logger.error(f"Job {job_id}: Error accessing file URL: {str(e)}")
+            logger.error("Job %s: Error accessing file URL: %s", job_id, e)
             return f"Error accessing file URL: {str(e)}", "/gdrive-upload", 500
         except ValueError as e:
-            logger.error(f"Job {job_id}: {str(e)}")
+            logger.error("Job %s: %s", job_id, e)
             return f"Unable to determine file size: {str(e)}", "/gdrive-upload", 500
 
-        logger.info(f"Job {job_id}: File size determined: {total_size} bytes")
+        logger.info("Job %s: File size determined: %s bytes", job_id, total_size)
+
+        # Small files skip the resumable session handshake and go up in one request
+        if total_size <= MULTIPART_UPLOAD_LIMIT:
+            file_id = upload_file_multipart(file_url, filename, folder_id, job_id, mime_type)
+            logger.info("Job %s: Upload complete (single multipart request).", job_id)
+            return file_id, "/gdrive-upload", 200
 
         # Initiate upload session
         upload_url = initiate_resumable_upload(filename, folder_id, mime_type)
-        logger.info(f"Job {job_id}: Resumable upload session initiated with chunk size {chunk_size} bytes.")
+        logger.info("Job %s: Resumable upload session initiated with chunk size %s bytes.", job_id, chunk_size)
 
         # Upload file in chunks
         file_id = upload_file_in_chunks(file_url, upload_url, total_size, job_id, chunk_size)
@@ -220,7 +317,7 @@ def gdrive_upload(job_id, data):
         return file_id, "/gdrive-upload", 200
 
     except Exception as e:
-        logger.error(f"Job {job_id}: Error during processing - {str(e)}")
+        logger.error("Job %s: Error during processing - %s", job_id, e)
         return str(e), "/gdrive-upload", 500
 
 def log_system_resources():
@@ -243,16 +340,16 @@ def log_system_resources():
                     if int(percentage) >= progress.last_logged_percentage + 1:
                         progress.last_logged_percentage = int(percentage)
                         logger.info(
-                            f"Job {progress.job_id}: Uploaded {progress.bytes_uploaded} of {progress.total_size} bytes "
-                            f"({percentage:.2f}%), Elapsed Time: {int(elapsed_time)} seconds"
+                            "Job %s: Uploaded %s of %s bytes (%.2f%%), Elapsed Time: %d seconds",
+                            progress.job_id, progress.bytes_uploaded, progress.total_size, percentage, elapsed_time
                         )
 
                     # Log system resource usage every 5%
                     if int(percentage) >= progress.last_logged_resource_percentage + 5:
                         progress.last_logged_resource_percentage = int(percentage)
                         current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        logger.info(f"[{current_time}] Memory Usage: {memory_info.percent}% used")
-                        logger.info(f"[{current_time}] Disk Usage: {disk_info.percent}% used")
+                        logger.info("[%s] Memory Usage: %s%% used", current_time, memory_info.percent)
+                        logger.info("[%s] Disk Usage: %s%% used", current_time, disk_info.percent)
 
         # Sleep for 1 second before the next update
         time.sleep(1)
@@ -20,7 +20,6 @@ import os
 import logging
 from flask import Blueprint, request, jsonify
 from app_utils import *
-from services.v1.ffmpeg.ffmpeg_compose import process_ffmpeg_compose
 from services.authentication import authenticate
 from services.cloud_storage import upload_file
 
@@ -117,6 +116,7 @@ def ffmpeg_api(job_id, data):
     logger.info(f"Job {job_id}: Received flexible FFmpeg request")
 
     try:
+        from services.v1.ffmpeg.ffmpeg_compose import process_ffmpeg_compose
         output_filenames, metadata = process_ffmpeg_compose(data, job_id)
         
         # Upload output files to GCP and create result array
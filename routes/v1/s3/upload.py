@@ -47,15 +47,15 @@ def s3_upload_endpoint(job_id, data):
         make_public = data.get('public', False)  # Default to private
         download_headers = data.get('download_headers')  # Optional headers for authentication
         
-        logger.info(f"Job {job_id}: Starting S3 streaming upload from {file_url}")
+        logger.info("Job %s: Starting S3 streaming upload from %s", job_id, file_url)
         
         # Call the service function to handle the upload
         result = stream_upload_to_s3(file_url, filename, make_public, download_headers)
         
-        logger.info(f"Job {job_id}: Successfully uploaded to S3")
+        logger.info("Job %s: Successfully uploaded to S3", job_id)
         
         return result, "/v1/s3/upload", 200
         
     except Exception as e:
-        logger.error(f"Job {job_id}: Error streaming upload to S3 - {str(e)}")
+        logger.error("Job %s: Error streaming upload to S3 - %s", job_id, e)
         return str(e), "/v1/s3/upload", 500
\ No newline at end of file
@@ -71,7 +71,7 @@ def get_all_jobs_status(job_id, data):
                 
                 # Check if the file was modified within the time range
                 if file_mod_time >= cutoff_time:
-                    job_id = filename.split('.')[0]  # Remove .json extension to get job_id
+                    job_id = filename[:-len('.json')]  # Remove .json extension to get job_id
                     
                     # Read the job status file
                     with open(job_file_path, 'r') as file:
@@ -16,16 +16,40 @@
 
 
 
+import hmac
 from functools import wraps
 from flask import request, jsonify
 from config import API_KEY
 
+# Encoded once at import; config refuses to start without an API_KEY
+EXPECTED_API_KEY = API_KEY.encode()
+
+UNAUTHORIZED_RESPONSE = {"message": "Unauthorized"}
+
+def is_valid_api_key(api_key):
+    """
+    Check a client-supplied API key against the configured one.
+
+    Uses a constant-time comparison so response timing doesn't reveal
+    how much of the key matched.
+
+    Args:
+        api_key (str): The value of the X-API-Key header, or None if missing
+
+    Returns:
+        bool: True if the key matches
+    """
+    if api_key is None:
+        return False
+    return hmac.compare_digest(api_key.encode(), EXPECTED_API_KEY)
+
 def authenticate(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
         api_key = request.headers.get('X-API-Key')
         
-        if api_key != API_KEY:
-            return jsonify({"message": "Unauthorized"}), 401
+        # A missing key is rejected before any comparison work
+        if not api_key or not is_valid_api_key(api_key):
+            return jsonify(UNAUTHORIZED_RESPONSE), 401
         return func(*args, **kwargs)
     return wrapper
@@ -73,15 +73,15 @@ class S3CompatibleProvider(CloudStorageProvider):
                 # The first part is the bucket name (sgp-labs)
                 if not self.bucket_name:
                     self.bucket_name = hostname_parts[0]
-                    logger.info(f"Extracted bucket name from URL: {self.bucket_name}")
+                    logger.info("Extracted bucket name from URL: %s", self.bucket_name)
                 
                 # The second part is the region (nyc3)
                 if not self.region:
                     self.region = hostname_parts[1]
-                    logger.info(f"Extracted region from URL: {self.region}")
+                    logger.info("Extracted region from URL: %s", self.region)
                 
             except Exception as e:
-                logger.warning(f"Failed to parse Digital Ocean URL: {e}. Using provided values.")
+                logger.warning("Failed to parse Digital Ocean URL: %s. Using provided values.", e)
 
     def upload_file(self, file_path: str) -> str:
         return upload_to_s3(file_path, self.endpoint_url, self.access_key, self.secret_key, self.bucket_name, self.region)
@@ -108,11 +108,11 @@ def get_storage_provider() -> CloudStorageProvider:
 def upload_file(file_path: str) -> str:
     provider = get_storage_provider()
     try:
-        logger.info(f"Uploading file to cloud storage: {file_path}")
+        logger.info("Uploading file to cloud storage: %s", file_path)
         url = provider.upload_file(file_path)
-        logger.info(f"File uploaded successfully: {url}")
+        logger.info("File uploaded successfully: %s", url)
         return url
     except Exception as e:
-        logger.error(f"Error uploading file to cloud storage: {e}")
+        logger.error("Error uploading file to cloud storage: %s", e)
         raise
     
\ No newline at end of file
@@ -0,0 +1,121 @@
+# Copyright (c) 2025 Stephen G. Pope
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+
+
+import threading
+from queue import Full
+
+DEFAULT_CAPACITY = 1024
+
+def _next_power_of_two(n):
+    """Return the smallest power of two that is >= n (minimum 1)."""
+    return 1 << max(n - 1, 0).bit_length()
+
+class RingQueue:
+    """
+    Ring buffer task queue with the subset of the queue.Queue API used by the app
+    (put, put_nowait, get, qsize, empty, task_done, join).
+
+    Items live in a preallocated power-of-two list indexed with a bit mask, and
+    consumers are woken through a single Event instead of the two condition
+    variables queue.Queue signals on every put/get. Slots are cleared as soon
+    as an item is taken so finished job payloads are not kept alive by the buffer.
+
+    Args:
+        maxsize (int): Maximum number of queued items. 0 means unbounded, in which
+            case the buffer starts at DEFAULT_CAPACITY and doubles when full.
+    """
+
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        capacity = _next_power_of_two(maxsize if maxsize > 0 else DEFAULT_CAPACITY)
+        self._buf = [None] * capacity
+        self._mask = capacity - 1
+        self._head = 0
+        self._tail = 0
+        self._lock = threading.Lock()
+        self._not_empty = threading.Event()
+        self._all_tasks_done = threading.Condition(self._lock)
+        self.unfinished_tasks = 0
+
+    def _grow(self):
+        # Unwind the ring into a buffer twice as large, keeping FIFO order
+        size = self._tail - self._head
+        items = [self._buf[(self._head + i) & self._mask] for i in range(size)]
+        capacity = len(self._buf) * 2
+        self._buf = items + [None] * (capacity - size)
+        self._mask = capacity - 1
+        self._head = 0
+        self._tail = size
+
+    def put(self, item, block=True, timeout=None):
+        """
+        Add an item to the queue.
+
+        Raises queue.Full if the queue is bounded and already holds maxsize items.
+        The block and timeout arguments are accepted for queue.Queue compatibility;
+        a full bounded queue is rejected immediately rather than waited on.
+        """
+        with self._lock:
+            size = self._tail - self._head
+            if self.maxsize > 0 and size >= self.maxsize:
+                raise Full
+            if size > self._mask:
+                self._grow()
+            self._buf[self._tail & self._mask] = item
+            self._tail += 1
+            self.unfinished_tasks += 1
+            # Only signal on the empty -> non-empty transition; consumers are
+            # already awake (or about to drain) when the event is set
+            if not self._not_empty.is_set():
+                self._not_empty.set()
+
+    def put_nowait(self, item):
+        return self.put(item, block=False)
+
+    def get(self):
+        """Remove and return the oldest item, blocking until one is available."""
+        while True:
+            with self._lock:
+                if self._head != self._tail:
+                    index = self._head & self._mask
+                    item = self._buf[index]
+                    self._buf[index] = None
+                    self._head += 1
+                    if self._head == self._tail:
+                        self._not_empty.clear()
+                    return item
+            self._not_empty.wait()
+
+    def qsize(self):
+        return self._tail - self._head
+
+    def empty(self):
+        return self._tail == self._head
+
+    def task_done(self):
+        with self._lock:
+            if self.unfinished_tasks <= 0:
+                raise ValueError('task_done() called too many times')
+            self.unfinished_tasks -= 1
+            if self.unfinished_tasks == 0:
+                self._all_tasks_done.notify_all()
+
+    def join(self):
+        with self._all_tasks_done:
+            while self.unfinished_tasks:
+                self._all_tasks_done.wait()
@@ -18,7 +18,10 @@
 
 import os
 import uuid
+import shutil
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, parse_qs
 import mimetypes
 
@@ -79,3 +82,42 @@ def download_file(url, storage_path="/tmp/"):
             os.remove(local_filename)
         raise e
 
+def download_files(urls, storage_path="/tmp/", max_workers=16):
+    """Download several files concurrently to local storage.
+    
+    Args:
+        urls (list): URLs to download
+        storage_path (str): Directory to save the files in
+        max_workers (int): Maximum number of concurrent downloads
+        
+    Returns:
+        list: Local file paths, in the same order as urls
+        
+    Raises:
+        Exception: The first download error, after removing any files that did download
+    """
+    if not urls:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        futures = [executor.submit(download_file, url, storage_path) for url in urls]
+    # Leaving the executor block waits for every download to finish
+
+    errors = [future.exception() for future in futures if future.exception() is not None]
+    if errors:
+        for future in futures:
+            if future.exception() is None and os.path.exists(future.result()):
+                os.remove(future.result())
+        raise errors[0]
+
+    return [future.result() for future in futures]
+
+def remove_directory_in_background(path):
+    """
+    Delete a directory tree on a daemon thread so the caller can return
+    without waiting on the filesystem. Errors are ignored.
+
+    Args:
+        path (str): Directory to remove
+    """
+    threading.Thread(target=shutil.rmtree, args=(path,), kwargs={'ignore_errors': True}, daemon=True).start()
@@ -20,15 +20,18 @@ import os
 import json
 import logging
 from google.oauth2 import service_account
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import storage
+from requests.adapters import HTTPAdapter
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # GCS environment variables
 GCP_BUCKET_NAME = os.getenv('GCP_BUCKET_NAME')
 STORAGE_PATH = "/tmp/"
+# Resumable upload chunk size (must be a multiple of 256 KB) and per-request timeout
+GCS_CHUNK_SIZE = 32 * 1024 * 1024
+GCS_UPLOAD_TIMEOUT = 300
 gcs_client = None
 
 def initialize_gcp_client():
@@ -47,9 +50,14 @@ def initialize_gcp_client():
             credentials_info,
             scopes=GCS_SCOPES
         )
-        return storage.Client(credentials=gcs_credentials)
+        # Share one pooled HTTP session across the upload threads instead of
+        # the client's default small connection pool
+        session = AuthorizedSession(gcs_credentials)
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        session.mount('https://', adapter)
+        return storage.Client(credentials=gcs_credentials, _http=session)
     except Exception as e:
-        logger.error(f"Failed to initialize GCS client: {e}")
+        logger.error("Failed to initialize GCS client: %s", e)
         return None
 
 # Initialize the GCS client
@@ -60,12 +68,14 @@ def upload_to_gcs(file_path, bucket_name=GCP_BUCKET_NAME):
         raise ValueError("GCS client is not initialized. Skipping file upload.")
 
     try:
-        logger.info(f"Uploading file to Google Cloud Storage: {file_path}")
+        logger.info("Uploading file to Google Cloud Storage: %s", file_path)
         bucket = gcs_client.bucket(bucket_name)
-        blob = bucket.blob(os.path.basename(file_path))
-        blob.upload_from_filename(file_path)
-        logger.info(f"File uploaded successfully to GCS: {blob.public_url}")
+        blob = bucket.blob(os.path.basename(file_path), chunk_size=GCS_CHUNK_SIZE)
+        # Skip the client-side checksum pass over the file; the transfer is
+        # already integrity-protected by TLS
+        blob.upload_from_filename(file_path, checksum=None, timeout=GCS_UPLOAD_TIMEOUT)
+        logger.info("File uploaded successfully to GCS: %s", blob.public_url)
         return blob.public_url
     except Exception as e:
-        logger.error(f"Error uploading file to GCS: {e}")
+        logger.error("Error uploading file to GCS: %s", e)
         raise
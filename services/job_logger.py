@@ -0,0 +1,80 @@
+# Copyright (c) 2025 Stephen G. Pope
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+
+
+import os
+import logging
+import threading
+from queue import SimpleQueue
+from app_utils import log_job_status
+
+logger = logging.getLogger(__name__)
+
+_status_queue = SimpleQueue()
+_worker = None
+_worker_lock = threading.Lock()
+
+def _process_status_updates():
+    # Only this thread touches the record and log_job_status serializes it
+    # before returning, so one dict is reused for every status write
+    record = {}
+    while True:
+        job_id, job_status, queue_id, process_id, response = _status_queue.get()
+        record["job_status"] = job_status
+        record["job_id"] = job_id
+        record["queue_id"] = queue_id
+        record["process_id"] = process_id
+        record["response"] = response
+        try:
+            log_job_status(job_id, record)
+        except Exception as e:
+            logger.error("Failed to write status for job %s: %s", job_id, e)
+        # Don't keep the finished job's response alive while waiting for the next update
+        record["response"] = None
+        del response
+
+def _start_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_process_status_updates, daemon=True)
+            _worker.start()
+
+def _reset_after_fork():
+    # Threads do not survive fork; let the child start its own writer
+    global _status_queue, _worker, _worker_lock
+    _status_queue = SimpleQueue()
+    _worker = None
+    _worker_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+def submit(job_id, job_status, queue_id, process_id, response=None):
+    """
+    Queue a job status update to be written by the background logger thread.
+    Updates for a job are written in the order they are submitted.
+
+    Args:
+        job_id (str): The unique job ID
+        job_status (str): One of "queued", "running" or "done"
+        queue_id (int): ID of the queue that owns the job
+        process_id (int): PID of the worker process
+        response (dict, optional): Final response payload for "done" updates
+    """
+    if _worker is None:
+        _start_worker()
+    _status_queue.put_nowait((job_id, job_status, queue_id, process_id, response))
@@ -19,10 +19,22 @@
 import os
 import boto3
 import logging
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from urllib.parse import urlparse, quote
 
 logger = logging.getLogger(__name__)
 
+# Larger multipart chunks and more concurrent part uploads for rendered videos;
+# the client pool is sized so the transfer threads don't queue for connections
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=16 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=16,
+    use_threads=True
+)
+CLIENT_CONFIG = Config(max_pool_connections=32, tcp_keepalive=True)
+
 def upload_to_s3(file_path, s3_url, access_key, secret_key, bucket_name, region):
     # Parse the S3 URL into bucket, region, and endpoint
     #bucket_name, region, endpoint_url = parse_s3_url(s3_url)
@@ -33,17 +45,26 @@ def upload_to_s3(file_path, s3_url, access_key, secret_key, bucket_name, region)
         region_name=region
     )
     
-    client = session.client('s3', endpoint_url=s3_url)
+    client = session.client('s3', endpoint_url=s3_url, config=CLIENT_CONFIG)
+
+    # The object key is the bare file name, used for both the upload and the URL
+    object_key = os.path.basename(file_path)
 
     try:
-        # Upload the file to the specified S3 bucket
-        with open(file_path, 'rb') as data:
-            client.upload_fileobj(data, bucket_name, os.path.basename(file_path), ExtraArgs={'ACL': 'public-read'})
+        # Upload the file to the specified S3 bucket. upload_file (unlike
+        # upload_fileobj) lets the transfer threads read parts in parallel
+        client.upload_file(
+            file_path,
+            bucket_name,
+            object_key,
+            ExtraArgs={'ACL': 'public-read'},
+            Config=TRANSFER_CONFIG
+        )
 
         # URL encode the filename for the URL
-        encoded_filename = quote(os.path.basename(file_path))
+        encoded_filename = quote(object_key)
         file_url = f"{s3_url}/{bucket_name}/{encoded_filename}"
         return file_url
     except Exception as e:
-        logger.error(f"Error uploading file to S3: {e}")
+        logger.error("Error uploading file to S3: %s", e)
         raise
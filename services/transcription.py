@@ -17,10 +17,8 @@
 
 
 import os
-import whisper
 import srt
 from datetime import timedelta
-from whisper.utils import WriteSRT, WriteVTT
 from services.file_management import download_file
 import logging
 import uuid
@@ -39,6 +37,7 @@ def process_transcription(media_url, output_type, max_chars=56, language=None,):
     logger.info(f"Downloaded media to local file: {input_filename}")
 
     try:
+        import whisper  # Imported on use: whisper pulls in torch, which is slow to load
         model = whisper.load_model("base")
         logger.info("Loaded Whisper model")
 
@@ -104,8 +103,9 @@ def process_transcription(media_url, output_type, max_chars=56, language=None,):
 def generate_ass_subtitle(result, max_chars):
     """Generate ASS subtitle content with highlighted current words, showing one line at a time."""
     logger.info("Generate ASS subtitle content with highlighted current words")
-    # ASS file header
-    ass_content = ""
+    # Dialogue lines are collected and joined once at the end; appending to a
+    # string here would copy the whole subtitle file for every word event
+    dialogue_lines = []
 
     # Helper function to format time
     def format_time(t):
@@ -172,6 +172,6 @@ def generate_ass_subtitle(result, max_chars):
                 end = format_time(end_time)
 
                 # Add the dialogue line
-                ass_content += f"Dialogue: 0,{start},{end},Default,,0,0,0,,{caption_with_highlight}\n"
+                dialogue_lines.append(f"Dialogue: 0,{start},{end},Default,,0,0,0,,{caption_with_highlight}\n")
 
-    return ass_content
\ No newline at end of file
+    return "".join(dialogue_lines)
\ No newline at end of file
@@ -0,0 +1,115 @@
+# Copyright (c) 2025 Stephen G. Pope
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+
+
+import logging
+import subprocess
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# Hardware H.264 encoders to try, in order of preference
+HARDWARE_ENCODERS = ['h264_nvenc', 'h264_qsv']
+
+# x264 preset names mapped to the nearest NVENC preset (p1 fastest .. p7 slowest)
+NVENC_PRESETS = {
+    'ultrafast': 'p1',
+    'superfast': 'p1',
+    'veryfast': 'p2',
+    'faster': 'p3',
+    'fast': 'p3',
+    'medium': 'p4',
+    'slow': 'p5',
+    'slower': 'p6',
+    'veryslow': 'p7',
+    'placebo': 'p7'
+}
+
+# h264_qsv only accepts veryfast..veryslow; the x264 extremes map to the nearest end
+QSV_PRESETS = {
+    'ultrafast': 'veryfast',
+    'superfast': 'veryfast',
+    'veryfast': 'veryfast',
+    'faster': 'faster',
+    'fast': 'fast',
+    'medium': 'medium',
+    'slow': 'slow',
+    'slower': 'slower',
+    'veryslow': 'veryslow',
+    'placebo': 'veryslow'
+}
+
+def _map_preset(video_preset, presets, default):
+    """Translate an x264 preset name into the encoder's own preset range."""
+    if video_preset in presets.values():
+        return video_preset  # Already a valid preset for this encoder
+    return presets.get(video_preset, default)
+
+def _encoder_works(encoder):
+    """Check that an encoder can actually encode a frame on this machine."""
+    # Being listed by `ffmpeg -encoders` only means FFmpeg was built with it;
+    # encoding a tiny test frame confirms the device and drivers are present
+    command = [
+        'ffmpeg', '-hide_banner', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', 'color=size=256x256:duration=0.1',
+        '-frames:v', '1', '-c:v', encoder, '-f', 'null', '-'
+    ]
+    try:
+        return subprocess.run(command, capture_output=True, timeout=30).returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+@lru_cache(maxsize=None)
+def detect_hardware_encoder():
+    """
+    Return the first usable hardware H.264 encoder, or None if there is none.
+    The probe runs once per process.
+    """
+    for encoder in HARDWARE_ENCODERS:
+        if _encoder_works(encoder):
+            logger.info("Using hardware video encoder %s", encoder)
+            return encoder
+    logger.info("No hardware video encoder available, using libx264")
+    return None
+
+def get_video_encoder_options(video_codec, video_preset='medium', video_crf=23):
+    """
+    Build ffmpeg-python output options for the requested video codec.
+
+    Args:
+        video_codec (str): Codec name, or 'auto' to use a hardware encoder when
+            one is available and fall back to libx264 otherwise
+        video_preset (str): x264-style preset, mapped to the nearest preset of a
+            hardware encoder
+        video_crf (int): Quality target, mapped to the encoder's equivalent
+
+    Returns:
+        dict: Output options (vcodec plus its preset/quality settings)
+    """
+    if video_codec == 'auto':
+        video_codec = detect_hardware_encoder() or 'libx264'
+
+    if video_codec == 'copy':
+        return {'vcodec': 'copy'}
+    if video_codec.endswith('_nvenc'):
+        # NVENC takes -cq for constant quality
+        preset = _map_preset(video_preset, NVENC_PRESETS, 'p4')
+        return {'vcodec': video_codec, 'preset': preset, 'tune': 'hq', 'rc': 'vbr', 'cq': str(video_crf)}
+    if video_codec.endswith('_qsv'):
+        preset = _map_preset(video_preset, QSV_PRESETS, 'medium')
+        return {'vcodec': video_codec, 'preset': preset, 'global_quality': str(video_crf)}
+    return {'vcodec': video_codec, 'preset': video_preset, 'crf': str(video_crf)}
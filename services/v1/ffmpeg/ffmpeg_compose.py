@@ -19,9 +19,13 @@
 import os
 import subprocess
 import json
-from services.file_management import download_file
+import logging
+from collections import deque
+from services.file_management import download_files
 from config import LOCAL_STORAGE_PATH
 
+logger = logging.getLogger(__name__)
+
 def get_extension_from_format(format_name):
     # Mapping of common format names to file extensions
     format_to_extension = {
@@ -45,6 +49,29 @@ def get_extension_from_format(format_name):
     }
     return format_to_extension.get(format_name.lower(), 'mp4')  # Default to mp4 if unknown
 
+def run_ffmpeg(command, stderr_lines=500):
+    """
+    Run an FFmpeg command, keeping only the last stderr_lines lines of its stderr
+    in memory instead of buffering the whole log of a long render.
+    
+    Raises:
+        Exception: If FFmpeg exits with a non-zero status, with the stderr tail
+    """
+    # errors='replace' because FFmpeg echoes input metadata that may not be valid UTF-8
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, errors='replace', bufsize=1)
+    # stderr is the only pipe, so it can be drained here without a reader thread.
+    # Text mode splits FFmpeg's \r-separated progress updates into separate lines
+    try:
+        with process.stderr:
+            stderr_tail = deque(process.stderr, maxlen=stderr_lines)
+    except BaseException:
+        # Don't leave FFmpeg running unreaped if reading its output fails
+        process.kill()
+        process.wait()
+        raise
+    if process.wait() != 0:
+        raise Exception(f"FFmpeg command failed: {''.join(stderr_tail)}")
+
 def get_metadata(filename, metadata_requests, job_id):
     metadata = {}
     if metadata_requests.get('thumbnail'):
@@ -61,7 +88,9 @@ def get_metadata(filename, metadata_requests, job_id):
             if os.path.exists(thumbnail_filename):
                 metadata['thumbnail'] = thumbnail_filename  # Return local path instead of URL
         except subprocess.CalledProcessError as e:
-            print(f"Thumbnail generation failed: {e.stderr}")
+            # One log record with only the end of stderr, where FFmpeg reports the error
+            stderr_tail = '\n'.join(e.stderr.splitlines()[-200:])
+            logger.error("Job %s: Thumbnail generation failed (rc=%d). Stderr tail:\n%s", job_id, e.returncode, stderr_tail)
 
     if metadata_requests.get('filesize'):
         metadata['filesize'] = os.path.getsize(filename)
@@ -105,17 +134,18 @@ def process_ffmpeg_compose(data, job_id):
         if "argument" in option and option["argument"] is not None:
             command.append(str(option["argument"]))
     
-    # Add inputs
-    input_paths = []
+    # Download all inputs concurrently; they are independent network transfers.
+    # A URL used by several inputs (e.g. a repeated clip) is only fetched once
+    unique_urls = list(dict.fromkeys(input_data["file_url"] for input_data in data["inputs"]))
+    downloaded_paths = dict(zip(unique_urls, download_files(unique_urls, LOCAL_STORAGE_PATH)))
+    
+    # Add inputs, looking up each one's local file as its arguments are built
     for input_data in data["inputs"]:
-        if "options" in input_data:
-            for option in input_data["options"]:
-                command.append(option["option"])
-                if "argument" in option and option["argument"] is not None:
-                    command.append(str(option["argument"]))
-        input_path = download_file(input_data["file_url"], LOCAL_STORAGE_PATH)
-        input_paths.append(input_path)
-        command.extend(["-i", input_path])
+        for option in input_data.get("options", ()):
+            command.append(option["option"])
+            if option.get("argument") is not None:
+                command.append(str(option["argument"]))
+        command.extend(["-i", downloaded_paths[input_data["file_url"]]])
     
     # Add filters
     if data.get("filters"):
@@ -141,13 +171,10 @@ def process_ffmpeg_compose(data, job_id):
         command.append(output_filename)
     
     # Execute FFmpeg command
-    try:
-        subprocess.run(command, check=True, capture_output=True, text=True)
-    except subprocess.CalledProcessError as e:
-        raise Exception(f"FFmpeg command failed: {e.stderr}")
+    run_ffmpeg(command)
     
-    # Clean up input files
-    for input_path in input_paths:
+    # Clean up input files (each downloaded file once, however many inputs used it)
+    for input_path in downloaded_paths.values():
         if os.path.exists(input_path):
             os.remove(input_path)
     
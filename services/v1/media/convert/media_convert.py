@@ -19,6 +19,7 @@ import ffmpeg
 import subprocess
 import logging
 from services.file_management import download_file
+from services.v1.ffmpeg.encoders import get_video_encoder_options
 from config import LOCAL_STORAGE_PATH
 
 # Set up logging
@@ -33,7 +34,7 @@ def process_media_convert(media_url, job_id, output_format='mp4', video_codec='l
         media_url (str): URL of the media file to convert
         job_id (str): Unique job identifier
         output_format (str): Target format (e.g., 'mp4', 'mov', 'mp3', etc.)
-        video_codec (str): Video codec to use (default: 'libx264')
+        video_codec (str): Video codec to use, or 'auto' for hardware encoding when available (default: 'libx264')
         video_preset (str): Encoding preset for speed/quality tradeoff (default: 'medium')
         video_crf (int): Constant Rate Factor for quality (0-51, default: 23)
         audio_codec (str): Audio codec to use (default: 'aac')
@@ -82,13 +83,10 @@ def process_media_convert(media_url, job_id, output_format='mp4', video_codec='l
             output_options['vn'] = None
         else:
             # For video formats, apply both video and audio codec settings
-            output_options['vcodec'] = video_codec
+            # Video codec plus its preset/quality options ('auto' picks a
+            # hardware encoder when one is available, otherwise libx264)
+            output_options.update(get_video_encoder_options(video_codec, video_preset, video_crf))
             output_options['acodec'] = audio_codec
-            
-            # Apply additional video encoding options when not using copy
-            if video_codec != 'copy':
-                output_options['preset'] = video_preset
-                output_options['crf'] = str(video_crf)
                 
             # Apply audio bitrate when not using copy
             if audio_codec != 'copy':
@@ -17,10 +17,8 @@
 
 
 import os
-import whisper
 import srt
 from datetime import timedelta
-from whisper.utils import WriteSRT, WriteVTT
 from services.file_management import download_file
 import logging
 from config import LOCAL_STORAGE_PATH
@@ -39,6 +37,7 @@ def process_transcribe_media(media_url, task, include_text, include_srt, include
         # Load a larger model for better translation quality
         #model_size = "large" if task == "translate" else "base"
         model_size = "base"
+        import whisper  # Imported on use: whisper pulls in torch, which is slow to load
         model = whisper.load_model(model_size)
         logger.info(f"Loaded Whisper {model_size} model")
 
@@ -17,6 +17,7 @@
 
 
 import os
+import posixpath
 import boto3
 import logging
 import requests
@@ -44,7 +45,7 @@ def get_s3_client():
 def get_filename_from_url(url):
     """Extract filename from URL."""
     path = urlparse(url).path
-    filename = os.path.basename(unquote(path))
+    filename = posixpath.basename(unquote(path))  # URL paths always use '/'
     
     # If filename cannot be determined, generate a UUID
     if not filename or filename == '':
@@ -80,7 +81,7 @@ def stream_upload_to_s3(file_url, custom_filename=None, make_public=False, downl
             filename = get_filename_from_url(file_url)
         
         # Start a multipart upload
-        logger.info(f"Starting multipart upload for {filename} to bucket {bucket_name}")
+        logger.info("Starting multipart upload for %s to bucket %s", filename, bucket_name)
         acl = 'public-read' if make_public else 'private'
         
         multipart_upload = s3_client.create_multipart_upload(
@@ -107,7 +108,7 @@ def stream_upload_to_s3(file_url, custom_filename=None, make_public=False, downl
             
             # When we have enough data for a part, upload it
             if len(buffer) >= chunk_size:
-                logger.info(f"Uploading part {part_number}")
+                logger.debug("Uploading part %s", part_number)
                 part = s3_client.upload_part(
                     Bucket=bucket_name,
                     Key=filename,
@@ -126,7 +127,7 @@ def stream_upload_to_s3(file_url, custom_filename=None, make_public=False, downl
         
         # Upload any remaining data as the final part
         if buffer:
-            logger.info(f"Uploading final part {part_number}")
+            logger.debug("Uploading final part %s", part_number)
             part = s3_client.upload_part(
                 Bucket=bucket_name,
                 Key=filename,
@@ -141,7 +142,7 @@ def stream_upload_to_s3(file_url, custom_filename=None, make_public=False, downl
             })
         
         # Complete the multipart upload
-        logger.info("Completing multipart upload")
+        logger.info("Completing multipart upload of %s (%d parts)", filename, len(parts))
         s3_client.complete_multipart_upload(
             Bucket=bucket_name,
             Key=filename,
@@ -170,5 +171,5 @@ def stream_upload_to_s3(file_url, custom_filename=None, make_public=False, downl
         }
         
     except Exception as e:
-        logger.error(f"Error streaming file to S3: {e}")
+        logger.error("Error streaming file to S3: %s", e)
         raise
\ No newline at end of file
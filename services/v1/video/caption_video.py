@@ -20,7 +20,6 @@ import os
 import ffmpeg
 import logging
 import subprocess
-import whisper
 from datetime import timedelta
 import srt
 import re
@@ -64,6 +63,7 @@ def rgb_to_ass_color(rgb_color):
 
 def generate_transcription(video_path, language='auto'):
     try:
+        import whisper  # Imported on use: whisper pulls in torch, which is slow to load
         model = whisper.load_model("base")
         transcription_options = {
             'word_timestamps': True,
@@ -18,9 +18,12 @@
 
 import os
 import ffmpeg
+import logging
 from services.file_management import download_file
 from config import LOCAL_STORAGE_PATH
 
+logger = logging.getLogger(__name__)
+
 def extract_thumbnail(video_url, job_id, second=0):
     """
     Extract a thumbnail from a video at the specified timestamp.
@@ -59,7 +62,13 @@ def extract_thumbnail(video_url, job_id, second=0):
         return thumbnail_path
         
     except Exception as e:
-        print(f"Thumbnail extraction failed: {str(e)}")
+        stderr = getattr(e, 'stderr', None)
+        if stderr:
+            # ffmpeg.Error carries the captured stderr; log its tail in the same record
+            stderr_tail = '\n'.join(stderr.decode('utf-8', errors='replace').splitlines()[-200:])
+            logger.error("Job %s: Thumbnail extraction failed: %s. Stderr tail:\n%s", job_id, e, stderr_tail)
+        else:
+            logger.error("Job %s: Thumbnail extraction failed: %s", job_id, e)
         # Clean up any downloaded files on error
         if os.path.exists(video_path):
             os.remove(video_path)
@@ -18,15 +18,37 @@
 
 import requests
 import logging
+import threading
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+_thread_local = threading.local()
+
+def _get_session():
+    """
+    Return this thread's webhook session, creating it on first use.
+
+    Sessions keep connections (and TLS) alive between jobs posting to the same
+    host. Nothing is retried: webhooks are sent synchronously on the queue
+    worker, so a retry backoff against a dead receiver would stall the next job.
+    """
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _thread_local.session = session
+    return session
+
 def send_webhook(webhook_url, data):
     """Send a POST request to a webhook URL with the provided data."""
     try:
-        logger.info(f"Attempting to send webhook to {webhook_url} with data: {data}")
-        response = requests.post(webhook_url, json=data)
+        # Lazy %-formatting: the payload repr is only built if INFO is enabled
+        logger.info("Attempting to send webhook to %s with data: %s", webhook_url, data)
+        response = _get_session().post(webhook_url, json=data)
         response.raise_for_status()
-        logger.info(f"Webhook sent: {data}")
+        logger.info("Webhook sent: %s", data)
     except requests.RequestException as e:
-        logger.error(f"Webhook failed: {e}")
+        logger.error("Webhook failed: %s", e)